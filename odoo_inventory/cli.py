@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+odoo-inventory: one CLI for the list_* tools, with an optional warm daemon. Read-only.
+
+Each subcommand maps to an existing script (list_warehouses.py, list_products.py, ...);
+the script is only imported when its subcommand runs, so `--help` and daemon lookups
+stay cheap.
+
+Warm-daemon mode keeps one process with an authenticated Odoo connection and serves
+subcommands over a local Unix socket. When the daemon is running, every subcommand is
+forwarded to it automatically (interactive use and n8n Execute Command alike); when it
+is not, the subcommand runs in-process as before.
+
+Usage:
+  ./odoo-inventory warehouses
+  ./odoo-inventory products --stockable --limit 200
+  ./odoo-inventory product 959
+  ./odoo-inventory product 1-200 --code C001,C002
+  ./odoo-inventory fields stock.lot --pretty
+
+  ./odoo-inventory daemon            # serve in the foreground (systemd, tmux, ...)
+  ./odoo-inventory daemon --status   # is a daemon answering on the socket?
+  ./odoo-inventory daemon --stop     # ask the running daemon to exit
+
+  ./odoo-inventory --no-daemon warehouses   # never use the daemon
+
+Socket path: ODOO_INVENTORY_SOCKET, default <tmpdir>/odoo-inventory-<uid>.sock.
+Protocol: one JSON request line; the daemon answers with JSON lines ("frames"):
+{"stdout": ...} / {"stderr": ...} as the command writes them, then {"code": N}.
+Loads ODOO_* from .env if present. Errors are JSON on stderr, like the scripts.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# subcommand -> (module, help). Modules expose add_arguments(ap) and run(args, execute_kw),
+# and optionally needs_odoo(args) -> False when run() can do without a connection.
+COMMANDS = {
+    "warehouses": ("list_warehouses", "List all warehouses (id, name, code)"),
+    "products": ("list_products", "List products (id, default_code, name) for mapping"),
+    "product": ("list_product_by_id", "Read products by ID, ID range or default_code (NDJSON)"),
+    "fields": ("list_inventory_fields", "List fields (columns) for inventory models; cached schema and --diff"),
+}
+
+# Same limit as sync_api.py's subprocess timeout
+REQUEST_TIMEOUT = 300
+
+# get_config() keys that must match between a client and the daemon serving it
+_IDENTITY_KEYS = ("url", "db", "username")
+
+
+def _load_env():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(os.path.join(SCRIPT_DIR, ".env"))
+    except ImportError:
+        pass
+
+
+def socket_path():
+    path = os.environ.get("ODOO_INVENTORY_SOCKET", "").strip()
+    if path:
+        return path
+    import tempfile
+
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(tempfile.gettempdir(), f"odoo-inventory-{uid}.sock")
+
+
+def _command_parser(command):
+    """Import the subcommand's module and build its argparse parser."""
+    module_name, help_text = COMMANDS[command]
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    module = importlib.import_module(module_name)
+    ap = argparse.ArgumentParser(prog=f"odoo-inventory {command}", description=help_text)
+    module.add_arguments(ap)
+    return module, ap
+
+
+def run_command(command, argv, execute_kw):
+    """Parse argv for one subcommand and run it with an existing execute_kw."""
+    module, ap = _command_parser(command)
+    args = ap.parse_args(argv)
+    return module.run(args, execute_kw)
+
+
+# --- client side -----------------------------------------------------------
+
+
+def _connect(path):
+    """Open a connection to the daemon; raises OSError if nothing is listening."""
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(REQUEST_TIMEOUT)
+        sock.connect(path)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+def _exchange(sock, payload, on_output=None):
+    """
+    Send one JSON request on a connected socket and return the final frame (the
+    one with "code"). Output frames before it are passed to on_output as they arrive.
+    """
+    import socket
+
+    sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+    sock.shutdown(socket.SHUT_WR)
+    with sock.makefile("rb") as f:
+        for line in f:
+            frame = json.loads(line.decode("utf-8"))
+            if "code" in frame:
+                return frame
+            if on_output:
+                on_output(frame)
+    raise ValueError("daemon closed the connection without an exit code")
+
+
+def _request(path, payload):
+    """Send one JSON request to the daemon and return its JSON response."""
+    with _connect(path) as sock:
+        return _exchange(sock, payload)
+
+
+def _daemon_available(path):
+    import socket
+
+    return hasattr(socket, "AF_UNIX") and os.path.exists(path)
+
+
+def _reads_stdin(command, argv):
+    """True if argv passes '-' (stdin) as an option or argument value, e.g. --codes-file=-."""
+    import io
+    from contextlib import redirect_stderr, redirect_stdout
+
+    _, ap = _command_parser(command)
+    try:
+        # Usage errors and --help are reported by whoever runs the command, not here
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            args = ap.parse_args(argv)
+    except SystemExit:
+        return False
+    return any(v == "-" or (isinstance(v, list) and "-" in v) for v in vars(args).values())
+
+
+def _forward(path, command, argv, cfg):
+    """
+    Run a subcommand on the daemon. Returns the exit code, or None if the daemon
+    could not be connected to (stale socket, daemon just exited) or is logged in to
+    a different Odoo than cfg, so the caller runs locally. Failures after the request
+    was sent (timeout, reset) return 1 rather than running the command twice.
+    """
+    payload = {
+        "op": "run",
+        "command": command,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        # The daemon only serves callers whose env points at the Odoo it is logged in to
+        "odoo": {k: cfg[k] for k in _IDENTITY_KEYS},
+    }
+    if _reads_stdin(command, argv):
+        # The daemon can't see our stdin, so send it. Keep a copy in sys.stdin so a
+        # local fallback (unreachable daemon) still reads the same data.
+        import io
+
+        payload["stdin"] = sys.stdin.read()
+        sys.stdin = io.StringIO(payload["stdin"])
+    try:
+        sock = _connect(path)
+    except OSError:
+        return None
+    with sock:
+        try:
+            resp = _exchange(sock, payload, _write_output)
+        except _OutputClosed:
+            # Our reader went away (e.g. `| head`); stop quietly like a local run would
+            sys.stdout = open(os.devnull, "w")
+            return 1
+        except (OSError, ValueError) as e:
+            # The request was sent and may have run (or still be running): don't
+            # run it a second time locally, report the failure instead.
+            print(json.dumps({"error": f"Lost connection to odoo-inventory daemon: {e}"}, indent=2), file=sys.stderr)
+            return 1
+    if resp.get("rejected"):
+        return None
+    return int(resp["code"])
+
+
+class _OutputClosed(Exception):
+    """Our own stdout/stderr was closed while relaying daemon output."""
+
+
+def _write_output(frame):
+    for name, stream in (("stdout", sys.stdout), ("stderr", sys.stderr)):
+        if name in frame:
+            try:
+                stream.write(frame[name])
+                stream.flush()
+            except BrokenPipeError as e:
+                raise _OutputClosed() from e
+
+
+def _run_local(command, argv):
+    # Parse before connecting so --help and usage errors don't need Odoo
+    module, ap = _command_parser(command)
+    args = ap.parse_args(argv)
+
+    execute_kw = None
+    needs_odoo = getattr(module, "needs_odoo", None)
+    if needs_odoo is None or needs_odoo(args):
+        from odoo_client import connect
+
+        _, _, execute_kw = connect()
+    return module.run(args, execute_kw)
+
+
+# --- daemon side -----------------------------------------------------------
+
+
+class _ClientGone(Exception):
+    """The client closed its connection while a command was still writing output."""
+
+
+class _FrameStream:
+    """
+    stdout/stderr replacement for commands run by the daemon: each complete line
+    (or whatever is pending on flush) is sent to the client as a frame right away,
+    so NDJSON output streams through the daemon instead of being buffered.
+    """
+
+    def __init__(self, send, name):
+        self._send = send
+        self._name = name
+        self._pending = ""
+
+    def write(self, text):
+        self._pending += text
+        if "\n" in self._pending:
+            lines, _, self._pending = self._pending.rpartition("\n")
+            self._send({self._name: lines + "\n"})
+        return len(text)
+
+    def flush(self):
+        if self._pending:
+            text, self._pending = self._pending, ""
+            self._send({self._name: text})
+
+    def isatty(self):
+        return False
+
+
+def _serve(path):
+    import io
+    import socket
+    import socketserver
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Daemon mode needs Unix domain sockets (not available on this platform)")
+
+    if os.path.exists(path):
+        try:
+            _request(path, {"op": "ping"})
+        except (ConnectionError, OSError, ValueError):
+            os.unlink(path)  # stale socket from a daemon that did not shut down cleanly
+        else:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+
+    from odoo_client import connect
+
+    cfg, uid, execute_kw = connect()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                req = json.loads(self.rfile.readline().decode("utf-8") or "{}")
+            except ValueError:
+                self._fail("Bad request")
+                return
+            op = req.get("op")
+            if op == "ping":
+                self._reply({"code": 0, "pid": os.getpid(), "url": cfg["url"], "db": cfg["db"], "uid": uid})
+                return
+            if op == "shutdown":
+                self._reply({"code": 0})
+                # shutdown() blocks until serve_forever returns, so it can't run on this thread
+                import threading
+
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            if op != "run" or req.get("command") not in COMMANDS:
+                self._fail("Unknown request")
+                return
+            if req.get("odoo") != {k: cfg[k] for k in _IDENTITY_KEYS}:
+                # Client's env names another Odoo/db/user; it runs the command itself
+                self._reply({"code": 2, "rejected": "Odoo connection does not match the daemon's"})
+                return
+
+            out, err = _FrameStream(self._reply, "stdout"), _FrameStream(self._reply, "stderr")
+            stdin, cwd = sys.stdin, os.getcwd()
+            try:
+                # Relative paths and '-' (stdin) in argv refer to the client's side
+                sys.stdin = io.StringIO(req.get("stdin") or "")
+                if req.get("cwd"):
+                    os.chdir(req["cwd"])
+                with redirect_stdout(out), redirect_stderr(err):
+                    code = run_command(req["command"], list(req.get("argv") or []), execute_kw)
+            except SystemExit as e:  # argparse --help / usage errors
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except _ClientGone:
+                print("odoo-inventory daemon: client disconnected during %s" % req["command"], file=sys.stderr)
+                return
+            except Exception as e:
+                code = 1
+                traceback.print_exc(file=sys.stderr)
+                try:
+                    err.write(json.dumps({"error": str(e)}, indent=2) + "\n")
+                except _ClientGone:
+                    return
+            finally:
+                sys.stdin = stdin
+                os.chdir(cwd)
+            try:
+                out.flush()
+                err.flush()
+                self._reply({"code": code or 0})
+            except _ClientGone:
+                pass
+
+        def _reply(self, frame):
+            try:
+                self.wfile.write(json.dumps(frame).encode("utf-8") + b"\n")
+            except OSError as e:
+                raise _ClientGone() from e
+
+        def _fail(self, message):
+            self._reply({"stderr": json.dumps({"error": message}) + "\n"})
+            self._reply({"code": 2})
+
+    # Single-threaded on purpose: requests are serialized, which keeps the
+    # redirected stdout/stderr/stdin, the cwd and the shared xmlrpc proxy safe.
+    old_umask = os.umask(0o177)  # socket carries authenticated access; owner only
+    try:
+        server = socketserver.UnixStreamServer(path, Handler)
+    finally:
+        os.umask(old_umask)
+    print(
+        "odoo-inventory daemon listening on %s (pid %s, %s db=%s)" % (path, os.getpid(), cfg["url"], cfg["db"]),
+        file=sys.stderr,
+        flush=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+    return 0
+
+
+def _daemon(args):
+    path = args.socket
+    if args.status or args.stop:
+        try:
+            resp = _request(path, {"op": "shutdown" if args.stop else "ping"})
+        except (ConnectionError, FileNotFoundError, OSError, ValueError):
+            print(json.dumps({"running": False, "socket": path}, indent=2))
+            return 1
+        if args.stop:
+            print(json.dumps({"stopped": True, "socket": path}, indent=2))
+        else:
+            resp.pop("code", None)
+            print(json.dumps({"running": True, "socket": path, **resp}, indent=2))
+        return 0
+    return _serve(path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="odoo-inventory",
+        description="Read-only Odoo inventory tools (optionally served by a warm daemon)",
+    )
+    ap.add_argument("--socket", default=None, help="Daemon socket path (default: $ODOO_INVENTORY_SOCKET or tmpdir)")
+    ap.add_argument("--no-daemon", action="store_true", help="Always run in-process, even if a daemon is running")
+    sub = ap.add_subparsers(dest="command", metavar="COMMAND")
+    for name, (_, help_text) in COMMANDS.items():
+        # Subcommand options are parsed by the module itself (imported lazily)
+        sub.add_parser(name, help=help_text, add_help=False)
+    dp = sub.add_parser("daemon", help="Serve subcommands from one authenticated process over a local socket")
+    dp.add_argument("--status", action="store_true", help="Report whether a daemon is running")
+    dp.add_argument("--stop", action="store_true", help="Stop the running daemon")
+
+    args, rest = ap.parse_known_args(argv)
+    if not args.command:
+        ap.print_help(sys.stderr)
+        return 2
+    args.socket = args.socket or socket_path()
+
+    if args.command == "daemon":
+        if rest:
+            ap.error("unrecognized arguments: %s" % " ".join(rest))
+        _load_env()
+        return _daemon(args)
+
+    _load_env()
+    if not args.no_daemon and _daemon_available(args.socket):
+        from odoo_client import get_config
+
+        try:
+            cfg = get_config()
+        except ValueError:
+            cfg = None  # incomplete env: the local run reports it
+        if cfg is not None:
+            code = _forward(args.socket, args.command, rest, cfg)
+            if code is not None:
+                return code
+
+    return _run_local(args.command, rest)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except Exception as e:
+        print(json.dumps({"error": str(e)}, indent=2), file=sys.stderr)
+        sys.exit(1)
@@ -3,11 +3,27 @@
 List all columns (fields) for Odoo inventory-related models.
 Use this to discover available fields (e.g. use_date, expiration_date on stock.lot).
 
+Models are introspected concurrently (fields_get per model in a thread pool) and
+cached on disk as a schema snapshot keyed by Odoo server version + installed module
+versions (see schema_cache.py), so repeat runs make no fields_get calls until Odoo is
+upgraded. --depth N also follows many2one targets N levels out from the given models.
+
 Usage:
-  python list_inventory_fields.py              # list fields for stock.quant, stock.lot, product.product
+  python list_inventory_fields.py              # list fields for stock.quant, stock.lot, product.product, stock.warehouse
   python list_inventory_fields.py stock.quant  # list fields for one model only
+  python list_inventory_fields.py --depth 1    # + models they reference via many2one
+  python list_inventory_fields.py --list-cache # cached snapshots (key, server_version, ...)
+  python list_inventory_fields.py --diff OLD_KEY                   # OLD snapshot vs current Odoo
+  python list_inventory_fields.py --diff OLD_KEY --against NEW_KEY # two cached snapshots
+  python list_inventory_fields.py --diff OLD_KEY --sync-fields     # only fields sync_stock.py reads
+
+Snapshots are referenced by key, unique key prefix or file path. --diff exits 1 when
+there are differences (like diff), 0 otherwise; field type and relation are compared.
+With --sync-fields, required fields missing from the new schema also count. Models the
+old snapshot never introspected are listed as unknown and don't count as differences.
 
-Requires ODOO_* in .env. All output is to stdout (JSON) or human-readable with --pretty.
+Requires ODOO_* in .env, except --list-cache and --diff ... --against, which only read
+the cache. All output is to stdout (JSON) or human-readable with --pretty.
 """
 import argparse
 import json
@@ -21,8 +37,6 @@ try:
 except ImportError:
     pass
 
-from odoo_client import connect
-
 # Models relevant to inventory; stock.lot has use_date, expiration_date, removal_date
 DEFAULT_MODELS = [
     "stock.quant",
@@ -31,27 +45,163 @@ DEFAULT_MODELS = [
     "stock.warehouse",
 ]
 
+DEFAULT_WORKERS = 8
 
-def main():
-    ap = argparse.ArgumentParser(description="List Odoo model fields (columns) for inventory models")
+
+def add_arguments(ap):
     ap.add_argument(
         "models",
         nargs="*",
-        default=DEFAULT_MODELS,
-        help=f"Model(s) to inspect (default: {', '.join(DEFAULT_MODELS)})",
+        help=f"Model(s) to inspect (default: {', '.join(DEFAULT_MODELS)}); with --diff, limits the comparison",
     )
     ap.add_argument("--pretty", "-p", action="store_true", help="Human-readable output")
-    args = ap.parse_args()
+    ap.add_argument("--depth", type=int, default=0, help="Follow many2one targets this many levels (default 0)")
+    ap.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Concurrent fields_get calls (default {DEFAULT_WORKERS})",
+    )
+    ap.add_argument("--refresh", action="store_true", help="Re-fetch models already in the cached snapshot")
+    ap.add_argument("--list-cache", action="store_true", help="List cached schema snapshots and exit")
+    ap.add_argument("--diff", metavar="OLD", help="Diff snapshot OLD (key, key prefix or path) against the current Odoo")
+    ap.add_argument("--against", metavar="NEW", help="With --diff: compare with cached snapshot NEW instead")
+    ap.add_argument("--sync-fields", action="store_true", help="With --diff: only fields sync_stock.py reads")
+
+
+def introspect(execute_kw, snapshot, models, depth=0, workers=DEFAULT_WORKERS, refresh=False):
+    """
+    fields_get each model (and many2one targets up to depth) concurrently, filling
+    snapshot["models"]. Returns {model: fields} in discovery order; models that
+    failed (no access, not installed) map to {"_error": ...} and are not cached.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from schema_cache import fetch_fields
 
-    _, _, execute_kw = connect()
+    cached = snapshot["models"]
     result = {}
+    level = list(dict.fromkeys(models))
+    seen = set(level)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for d in range(depth + 1):
+            todo = [m for m in level if refresh or m not in cached]
+            futures = {m: pool.submit(fetch_fields, execute_kw, m) for m in todo}
+            errors = {}
+            for model, future in futures.items():
+                try:
+                    cached[model] = future.result()
+                except Exception as e:
+                    errors[model] = {"_error": str(e)}
+            next_level = []
+            for model in level:
+                if model in errors:
+                    result[model] = errors[model]
+                    continue
+                result[model] = cached[model]
+                if d == depth:
+                    continue
+                for info in cached[model].values():
+                    target = info.get("relation")
+                    if info.get("type") == "many2one" and target and target not in seen:
+                        seen.add(target)
+                        next_level.append(target)
+            level = next_level
+            if not level:
+                break
+    return result
 
-    for model in args.models:
-        try:
-            fields = execute_kw(model, "fields_get", [], {"attributes": ["string", "type"]})
-            result[model] = {name: {"type": info.get("type"), "string": info.get("string", "")} for name, info in fields.items()}
-        except Exception as e:
-            result[model] = {"_error": str(e)}
+
+def _summary(snapshot):
+    modules = snapshot.get("modules")
+    return {
+        "key": snapshot.get("key"),
+        "server_version": snapshot.get("server_version"),
+        "module_count": len(modules) if modules is not None else None,
+        "created_at": snapshot.get("created_at"),
+    }
+
+
+def _diff(args, execute_kw):
+    from schema_cache import current_snapshot, diff_models, load_snapshot, save_snapshot
+
+    old = load_snapshot(args.diff)
+
+    only = None
+    if args.sync_fields:
+        from sync_stock import ODOO_FIELDS_USED
+
+        only = {m: f for m, f in ODOO_FIELDS_USED.items() if not args.models or m in args.models}
+        wanted = sorted(only)
+    else:
+        wanted = args.models or sorted(old["models"])
+
+    if args.against:
+        new = load_snapshot(args.against)
+    else:
+        new = current_snapshot(execute_kw)
+        todo = [m for m in wanted if m not in new["models"]]
+        if todo:
+            introspect(execute_kw, new, todo, workers=args.workers)
+            save_snapshot(new)
+        if new["key"] == old.get("key"):
+            old = new  # same schema, so models just introspected are known on both sides
+
+    old_models = {m: f for m, f in old["models"].items() if m in wanted}
+    new_models = {m: f for m, f in new["models"].items() if m in wanted}
+    result = {"old": _summary(old), "new": _summary(new)}
+    result.update(diff_models(old_models, new_models, only))
+    changed = any(result[k] for k in ("models", "only_in_old", "missing_in_new"))
+
+    if args.pretty:
+        print(f"old: {old.get('key')} (Odoo {old.get('server_version')}, {old.get('created_at')})")
+        print(f"new: {new.get('key')} (Odoo {new.get('server_version')}, {new.get('created_at')})")
+        if result["only_in_old"]:
+            print(f"Models only in old: {', '.join(result['only_in_old'])}")
+        if result["unknown_in_old"]:
+            print(f"Not in old snapshot (not compared): {', '.join(result['unknown_in_old'])}")
+        if result["missing_in_new"]:
+            print(f"Required fields missing in new: {', '.join(result['missing_in_new'])}")
+        for model, d in result["models"].items():
+            print(f"## {model}")
+            for name in d["added"]:
+                print(f"  + {name}")
+            for name in d["removed"]:
+                print(f"  - {name}")
+            for name, c in d["changed"].items():
+                print(f"  ~ {name}: {c['old']} -> {c['new']}")
+        if not changed:
+            print("No differences.")
+    else:
+        print(json.dumps(result, indent=2))
+    return 1 if changed else 0
+
+
+def needs_odoo(args):
+    """False when run() only reads cached snapshots (--list-cache, --diff A --against B)."""
+    return not (args.list_cache or args.against)
+
+
+def run(args, execute_kw):
+    """execute_kw may be None when needs_odoo(args) is False."""
+    from schema_cache import current_snapshot, list_snapshots, save_snapshot
+
+    if args.list_cache:
+        print(json.dumps({"snapshots": list_snapshots()}, indent=2))
+        return 0
+    if args.diff:
+        return _diff(args, execute_kw)
+    if args.against or args.sync_fields:
+        raise ValueError("--against and --sync-fields need --diff")
+
+    snapshot = current_snapshot(execute_kw)
+    result = introspect(
+        execute_kw, snapshot, args.models or DEFAULT_MODELS,
+        depth=args.depth, workers=args.workers, refresh=args.refresh,
+    )
+    save_snapshot(snapshot)
+    print(
+        f"Schema {snapshot['key']} (Odoo {snapshot['server_version']}): {len(result)} models",
+        file=sys.stderr,
+    )
 
     if args.pretty:
         for model, data in result.items():
@@ -61,7 +211,8 @@ def main():
             print(f"## {model} ({len(data)} fields)")
             for name in sorted(data.keys()):
                 info = data[name]
-                print(f"  {name}: {info.get('type', '?')}  ({info.get('string', '')})")
+                relation = f" -> {info['relation']}" if info.get("relation") else ""
+                print(f"  {name}: {info.get('type', '?')}{relation}  ({info.get('string', '')})")
             print()
     else:
         print(json.dumps(result, indent=2))
@@ -69,6 +220,19 @@ def main():
     return 0
 
 
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="List Odoo model fields (columns) for inventory models")
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    execute_kw = None
+    if needs_odoo(args):
+        from odoo_client import connect
+
+        _, _, execute_kw = connect()
+    return run(args, execute_kw)
+
+
 if __name__ == "__main__":
     try:
         sys.exit(main())
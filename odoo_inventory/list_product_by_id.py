@@ -1,13 +1,24 @@
 #!/usr/bin/env python3
 """
-Read a single product by ID and output all fields from product.product.
-Useful to inspect use_time, expiration_time, use_expiration_date, etc.
+Read products from product.product by ID, ID range or default_code.
+Useful to inspect use_time, expiration_time, use_expiration_date, etc., and to map
+Odoo product IDs to Kisaan product IDs in bulk.
+
+Products are read in chunked batch calls. By default only non-binary fields are
+requested (field list from a cached fields_get, see schema_cache.py), so image blobs
+are never downloaded. Output is NDJSON: one product per line, streamed per chunk.
 
 Usage:
-  python list_product_by_id.py           # product id 959
-  python list_product_by_id.py 123       # product id 123
+  python list_product_by_id.py                    # product id 959
+  python list_product_by_id.py 123                # product id 123
+  python list_product_by_id.py 1-200 350 400,401  # ranges and lists
+  python list_product_by_id.py --code C001,C002   # by default_code
+  python list_product_by_id.py --codes-file codes.txt   # one code per line ('-' = stdin)
+  python list_product_by_id.py 959 --fields name,default_code,use_time
+  python list_product_by_id.py 959 --all-fields   # every field (binary shown as placeholders)
 
-Requires ODOO_* in .env. Output is JSON to stdout.
+Requires ODOO_* in .env. Missing IDs/codes are reported as {"error": ...} lines and
+the exit code is 1.
 """
 import argparse
 import json
@@ -21,8 +32,6 @@ try:
 except ImportError:
     pass
 
-from odoo_client import connect
-
 
 def sanitize_for_json(val):
     """Replace binary/large values with a placeholder so JSON is readable."""
@@ -41,23 +50,143 @@ def sanitize_for_json(val):
     return val
 
 
-def main():
-    ap = argparse.ArgumentParser(description="Read one product.product by ID with all fields")
-    ap.add_argument("product_id", type=int, nargs="?", default=959, help="Product ID (default: 959)")
-    args = ap.parse_args()
+MODEL = "product.product"
+DEFAULT_CHUNK_SIZE = 100
 
-    _, _, execute_kw = connect()
 
-    # read() without 'fields' returns all fields for the given ids
-    rows = execute_kw("product.product", "read", [[args.product_id]])
-    if not rows:
-        print(json.dumps({"error": "Product not found", "id": args.product_id}, indent=2))
-        return 1
+def id_token(token):
+    """
+    argparse type for the ids positional: '12', '1-50' or '3,7,9' -> list of IDs.
+    Bad tokens ('abc', '5-', '-3', '9-2') are reported as a usage error.
+    """
+    ids = []
+    for part in token.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        if not lo.isdigit() or (sep and not hi.isdigit()):
+            raise argparse.ArgumentTypeError(f"invalid product ID or range: '{part}' (use 12, 1-50 or 3,7,9)")
+        if not sep:
+            ids.append(int(lo))
+        elif int(hi) < int(lo):
+            raise argparse.ArgumentTypeError(f"empty ID range: '{part}'")
+        else:
+            ids.extend(range(int(lo), int(hi) + 1))
+    if not ids:
+        raise argparse.ArgumentTypeError(f"no product ID in '{token}'")
+    return ids
+
+
+def parse_ids(tokens):
+    """Expand ID tokens (strings or id_token() lists) into a de-duplicated, ordered ID list."""
+    ids = []
+    for token in tokens:
+        ids.extend(id_token(token) if isinstance(token, str) else token)
+    return list(dict.fromkeys(ids))
+
+
+def _parse_codes(values, codes_file):
+    codes = [c.strip() for v in values or [] for c in v.split(",")]
+    if codes_file:
+        f = sys.stdin if codes_file == "-" else open(codes_file)
+        try:
+            codes.extend(line.strip() for line in f)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    return list(dict.fromkeys(c for c in codes if c))
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _emit(obj):
+    sys.stdout.write(json.dumps(obj, default=str) + "\n")
+
 
-    product = rows[0]
-    out = sanitize_for_json(product)
-    print(json.dumps(out, indent=2, default=str))
-    return 0
+def add_arguments(ap):
+    ap.add_argument(
+        "ids",
+        nargs="*",
+        type=id_token,
+        help="Product IDs, ranges (1-50) or comma lists (default: 959 when no --code given)",
+    )
+    ap.add_argument("--code", "-c", action="append", help="default_code(s), comma-separated; repeatable")
+    ap.add_argument("--codes-file", help="File with one default_code per line ('-' for stdin)")
+    ap.add_argument("--fields", "-f", help="Comma-separated fields to read (default: all non-binary fields)")
+    ap.add_argument("--all-fields", action="store_true", help="Read every field, including binary")
+    ap.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help=f"Records per read call (default {DEFAULT_CHUNK_SIZE})",
+    )
+    ap.add_argument("--refresh-fields", action="store_true", help="Re-fetch fields_get instead of using the cached schema snapshot")
+
+
+def run(args, execute_kw):
+    ids = parse_ids(args.ids)
+    codes = _parse_codes(args.code, args.codes_file)
+    if not ids and not codes:
+        ids = [959]
+    if args.chunk_size < 1:
+        raise ValueError("--chunk-size must be at least 1")
+
+    if args.fields:
+        fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+    elif args.all_fields:
+        fields = None  # read() without 'fields' returns all fields
+    else:
+        from schema_cache import non_binary_fields
+
+        fields = non_binary_fields(execute_kw, MODEL, refresh=args.refresh_fields)
+    kwargs = {"fields": fields} if fields else {}
+
+    missing = 0
+    for chunk in _chunks(ids, args.chunk_size):
+        rows = execute_kw(MODEL, "read", [chunk], kwargs)
+        found = set()
+        for row in rows:
+            found.add(row.get("id"))
+            _emit(sanitize_for_json(row))
+        for pid in chunk:
+            if pid not in found:
+                missing += 1
+                _emit({"error": "Product not found", "id": pid})
+        sys.stdout.flush()
+
+    # Match codes against default_code even if --fields leaves it out (then dropped
+    # again so rows look like the ones read by ID), and include archived products so a
+    # code lookup finds the same records as a read by ID.
+    code_kwargs = {"context": {"active_test": False}}
+    drop_code = bool(fields) and "default_code" not in fields
+    if fields:
+        code_kwargs["fields"] = list(dict.fromkeys(["default_code"] + fields))
+    for chunk in _chunks(codes, args.chunk_size):
+        rows = execute_kw(MODEL, "search_read", [[["default_code", "in", chunk]]], code_kwargs)
+        found = set()
+        for row in rows:
+            found.add(row.pop("default_code") if drop_code else row.get("default_code"))
+            _emit(sanitize_for_json(row))
+        for code in chunk:
+            if code not in found:
+                missing += 1
+                _emit({"error": "Product not found", "default_code": code})
+        sys.stdout.flush()
+
+    return 1 if missing else 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Read product.product records by ID, range or default_code")
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    from odoo_client import connect
+
+    _, _, execute_kw = connect()
+    return run(args, execute_kw)
 
 
 if __name__ == "__main__":
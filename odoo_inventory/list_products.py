@@ -17,17 +17,13 @@ try:
 except ImportError:
     pass
 
-from odoo_client import connect
 
-
-def main():
-    ap = argparse.ArgumentParser(description="List Odoo products for mapping")
+def add_arguments(ap):
     ap.add_argument("--stockable", action="store_true", help="Only stockable products")
     ap.add_argument("--limit", type=int, default=500, help="Max records (default 500)")
-    args = ap.parse_args()
 
-    cfg, uid, execute_kw = connect()
 
+def run(args, execute_kw):
     domain = []
     if args.stockable:
         # product.product: type 'product' = stockable
@@ -59,6 +55,17 @@ def main():
     return 0
 
 
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="List Odoo products for mapping")
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    from odoo_client import connect
+
+    _, _, execute_kw = connect()
+    return run(args, execute_kw)
+
+
 if __name__ == "__main__":
     try:
         sys.exit(main())
@@ -4,8 +4,8 @@ List all warehouses from Odoo (dynamic — no hardcoded IDs). Read-only.
 Run locally: python list_warehouses.py
 Loads ODOO_* from .env if present.
 """
+import argparse
 import json
-import os
 import sys
 
 # Load .env when running locally (n8n can inject env instead)
@@ -15,12 +15,12 @@ try:
 except ImportError:
     pass
 
-from odoo_client import connect
 
+def add_arguments(ap):
+    """No options; kept so the odoo-inventory CLI can treat every tool the same."""
 
-def main():
-    cfg, uid, execute_kw = connect()
 
+def run(args, execute_kw):
     # Dynamic: fetch all active warehouses (and inactive if you want)
     warehouses = execute_kw(
         "stock.warehouse",
@@ -43,6 +43,17 @@ def main():
     return 0
 
 
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="List Odoo warehouses")
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    from odoo_client import connect
+
+    _, _, execute_kw = connect()
+    return run(args, execute_kw)
+
+
 if __name__ == "__main__":
     try:
         sys.exit(main())
@@ -4,6 +4,7 @@ READ-ONLY: we never create, write, or unlink in Odoo; only read operations.
 Uses stdlib xmlrpc.client; auth via login + password (password can be API key).
 """
 import os
+import threading
 import xmlrpc.client
 from urllib.parse import urljoin
 
@@ -24,8 +25,9 @@ def get_config():
 def connect():
     """
     Authenticate with Odoo and return a client that can call execute_kw.
-    Returns (config, uid, object_proxy) so you can do:
-      object_proxy.execute_kw(db, uid, password, 'stock.warehouse', 'search_read', ...)
+    Returns (config, uid, execute_kw) so you can do:
+      execute_kw('stock.warehouse', 'search_read', [[]], {'fields': ['name']})
+    execute_kw is safe to call from multiple threads.
     """
     cfg = get_config()
     url = cfg["url"]
@@ -40,9 +42,15 @@ def connect():
     if not uid:
         raise PermissionError("Odoo authentication failed (check URL, db, user, password/api key)")
 
-    object_proxy = xmlrpc.client.ServerProxy(
-        urljoin(url + "/", "xmlrpc/2/object"), allow_none=True
-    )
+    # ServerProxy reuses one HTTP connection and is not thread-safe; give each thread
+    # its own so execute_kw can be called from a thread pool (list_inventory_fields.py).
+    object_url = urljoin(url + "/", "xmlrpc/2/object")
+    proxies = threading.local()
+
+    def object_proxy():
+        if not hasattr(proxies, "proxy"):
+            proxies.proxy = xmlrpc.client.ServerProxy(object_url, allow_none=True)
+        return proxies.proxy
 
     # Read-only: only allow methods that do not modify Odoo data
     _READ_ONLY_METHODS = frozenset(
@@ -54,6 +62,15 @@ def connect():
             raise PermissionError(
                 f"Read-only client: '{method}' not allowed. Use only: {sorted(_READ_ONLY_METHODS)}"
             )
-        return object_proxy.execute_kw(db, uid, password, model, method, args, kwargs or {})
+        return object_proxy().execute_kw(db, uid, password, model, method, args, kwargs or {})
 
     return cfg, uid, execute_kw
+
+
+def server_version():
+    """Odoo server version string (e.g. '17.0+e'); unauthenticated common.version()."""
+    cfg = get_config()
+    common = xmlrpc.client.ServerProxy(
+        urljoin(cfg["url"] + "/", "xmlrpc/2/common"), allow_none=True
+    )
+    return common.version().get("server_version", "")
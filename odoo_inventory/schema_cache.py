@@ -0,0 +1,229 @@
+"""
+Cached Odoo fields_get (model schema) for the local scripts. READ-ONLY for Odoo.
+
+fields_get is slow on large models and its result only changes when Odoo or its
+modules are upgraded, so results are kept in schema snapshots: one JSON file per Odoo
+server version + installed module versions, holding every model introspected so far.
+An upgrade starts a new snapshot, and two snapshots can be diffed
+(list_inventory_fields.py --diff). fields_get() serves single models from the current
+snapshot (list_product_by_id.py), memoized in-process so the odoo-inventory daemon
+keeps it warm.
+
+Cache dir: ODOO_INVENTORY_CACHE_DIR, default .cache/ next to these scripts.
+"""
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Attributes kept per field; enough for projection (type) and relation discovery
+FIELD_ATTRIBUTES = ["string", "type", "relation"]
+
+# (url, db) -> current snapshot, for the life of the process. A daemon started before
+# an Odoo upgrade keeps its snapshot until restarted or called with refresh=True.
+_snapshots = {}
+
+
+def cache_dir():
+    return os.environ.get("ODOO_INVENTORY_CACHE_DIR", "").strip() or os.path.join(SCRIPT_DIR, ".cache")
+
+
+def fields_get(execute_kw, model, refresh=False):
+    """
+    Return {field_name: {"string", "type", "relation"}} for one model from the
+    current schema snapshot, fetching and saving it if the snapshot lacks it.
+    refresh=True re-checks the Odoo version/modules and re-fetches the model.
+    """
+    conn = (os.environ.get("ODOO_URL", "").rstrip("/"), os.environ.get("ODOO_DB", ""))
+    snapshot = _snapshots.get(conn)
+    if snapshot is None or refresh:
+        snapshot = _snapshots[conn] = current_snapshot(execute_kw)
+    if refresh or model not in snapshot["models"]:
+        snapshot["models"][model] = fetch_fields(execute_kw, model)
+        save_snapshot(snapshot)
+    return snapshot["models"][model]
+
+
+def fetch_fields(execute_kw, model):
+    """Uncached fields_get for one model, trimmed to FIELD_ATTRIBUTES."""
+    raw = execute_kw(model, "fields_get", [], {"attributes": FIELD_ATTRIBUTES})
+    return {
+        name: {attr: info.get(attr) for attr in FIELD_ATTRIBUTES if info.get(attr) not in (None, False)}
+        for name, info in raw.items()
+    }
+
+
+def _write_json(path, obj):
+    """Atomically replace path; a unique temp file per write so concurrent writers don't collide."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+    except OSError:
+        return  # cache is best-effort (read-only checkout, etc.)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(obj, f)
+        os.replace(tmp, path)
+        tmp = None
+    except OSError:
+        pass
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def non_binary_fields(execute_kw, model, refresh=False):
+    """Field names of model excluding binary ones (images, attachments)."""
+    fields = fields_get(execute_kw, model, refresh=refresh)
+    return sorted(name for name, info in fields.items() if info.get("type") != "binary")
+
+
+# --- schema snapshots --------------------------------------------------------
+
+
+def _snapshot_dir():
+    return os.path.join(cache_dir(), "schema")
+
+
+def schema_identity(execute_kw):
+    """
+    Return (server_version, modules) for the connected Odoo, where modules is
+    {name: installed version}. modules is None if the user can't read
+    ir.module.module (an XML-RPC Fault); snapshots are then keyed by server version
+    alone. Network errors propagate rather than silently changing the key.
+    """
+    from xmlrpc.client import Fault
+
+    from odoo_client import server_version
+
+    version = server_version()
+    try:
+        rows = execute_kw(
+            "ir.module.module",
+            "search_read",
+            [[["state", "=", "installed"]]],
+            {"fields": ["name", "latest_version"]},
+        )
+        modules = {r["name"]: r.get("latest_version") or "" for r in rows}
+    except Fault:
+        modules = None
+    return version, modules
+
+
+def current_snapshot(execute_kw):
+    """Load (or start) the snapshot for the connected Odoo's version and module list."""
+    url = os.environ.get("ODOO_URL", "").rstrip("/")
+    db = os.environ.get("ODOO_DB", "")
+    version, modules = schema_identity(execute_kw)
+    blob = json.dumps([url, db, version, modules], sort_keys=True)
+    key = hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(_snapshot_dir(), f"{key}.json")
+    if os.path.isfile(path):
+        try:
+            return load_snapshot(path)
+        except (OSError, ValueError):
+            pass
+    return {
+        "key": key,
+        "url": url,
+        "db": db,
+        "server_version": version,
+        "modules": modules,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "models": {},
+    }
+
+
+def save_snapshot(snapshot):
+    """Write snapshot, keeping models another process added to the same file meanwhile."""
+    path = os.path.join(_snapshot_dir(), f"{snapshot['key']}.json")
+    try:
+        on_disk = load_snapshot(path)
+    except (OSError, ValueError):
+        on_disk = None
+    if on_disk:
+        for model, fields in (on_disk.get("models") or {}).items():
+            snapshot["models"].setdefault(model, fields)
+    _write_json(path, snapshot)
+
+
+def load_snapshot(ref):
+    """Load a snapshot by file path, key, or unique key prefix."""
+    if os.path.isfile(ref):
+        path = ref
+    else:
+        matches = glob.glob(os.path.join(_snapshot_dir(), f"{glob.escape(ref)}*.json"))
+        if len(matches) != 1:
+            raise ValueError(
+                f"No cached schema matches '{ref}'" if not matches else f"Schema key '{ref}' is ambiguous"
+            )
+        path = matches[0]
+    with open(path) as f:
+        return json.load(f)
+
+
+def list_snapshots():
+    """Summaries of all cached snapshots, oldest first."""
+    out = []
+    for path in glob.glob(os.path.join(_snapshot_dir(), "*.json")):
+        try:
+            snap = load_snapshot(path)
+        except (OSError, ValueError):
+            continue
+        modules = snap.get("modules")
+        out.append({
+            "key": snap.get("key"),
+            "url": snap.get("url"),
+            "db": snap.get("db"),
+            "server_version": snap.get("server_version"),
+            "module_count": len(modules) if modules is not None else None,
+            "model_count": len(snap.get("models") or {}),
+            "created_at": snap.get("created_at"),
+        })
+    return sorted(out, key=lambda s: s.get("created_at") or "")
+
+
+def diff_models(old, new, only=None):
+    """
+    Compare two {model: {field: info}} maps. Field type and relation are compared;
+    labels ("string") are ignored since they change with translations.
+    only: optional {model: [field, ...]} restricting the comparison; any of those
+    fields absent from new are also listed in "missing_in_new" as "model.field".
+    A model absent from old was never introspected there, so it is listed in
+    "unknown_in_old" rather than treated as a difference.
+    Returns {"only_in_old", "unknown_in_old", "missing_in_new",
+    "models": {model: {"added", "removed", "changed"}}} with empty models omitted.
+    """
+    models = sorted(only) if only else sorted(set(old) | set(new))
+    result = {"only_in_old": [], "unknown_in_old": [], "missing_in_new": [], "models": {}}
+    for model in models:
+        if only:
+            result["missing_in_new"].extend(
+                f"{model}.{n}" for n in sorted(only[model]) if n not in new.get(model, {})
+            )
+        if model not in old:
+            result["unknown_in_old"].append(model)
+            continue
+        if model not in new:
+            result["only_in_old"].append(model)
+            continue
+        a, b = old[model], new[model]
+        names = set(only[model]) if only else set(a) | set(b)
+        added = sorted(n for n in names if n in b and n not in a)
+        removed = sorted(n for n in names if n in a and n not in b)
+        changed = {}
+        for n in sorted(names & set(a) & set(b)):
+            before = {k: a[n].get(k) for k in ("type", "relation")}
+            after = {k: b[n].get(k) for k in ("type", "relation")}
+            if before != after:
+                changed[n] = {"old": before, "new": after}
+        if added or removed or changed:
+            result["models"][model] = {"added": added, "removed": removed, "changed": changed}
+    return result
@@ -32,6 +32,15 @@ except ImportError:
 
 from odoo_client import connect
 
+# Odoo fields read by fetch_stock_from_odoo (keep in sync when adding fields).
+# `list_inventory_fields.py --diff ... --sync-fields` checks these across Odoo upgrades.
+ODOO_FIELDS_USED = {
+    "stock.warehouse": ["active", "code", "lot_stock_id", "name"],
+    "product.product": ["active", "categ_id", "default_code", "name"],
+    "product.category": ["complete_name", "name"],
+    "stock.quant": ["location_id", "product_id", "quantity", "reserved_quantity"],
+}
+
 
 def fetch_stock_from_odoo(execute_kw, warehouse_id=None):
     """
@@ -48,7 +57,7 @@ def fetch_stock_from_odoo(execute_kw, warehouse_id=None):
         {"fields": ["id", "name", "code", "lot_stock_id"], "order": "name"},
     )
     if not warehouses:
-        return [], []
+        return [], [], set()
 
     # 1. Fetch all active products (no stockable filter; includes services, consumables, etc.)
     prod_domain = [["active", "=", True]]
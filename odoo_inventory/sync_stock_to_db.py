@@ -17,11 +17,6 @@ try:
 except ImportError:
     pass
 
-from supabase import create_client
-
-from odoo_client import connect
-from sync_stock import fetch_stock_from_odoo
-
 
 def main():
     # Prefer SUPABASE_*, fall back to VITE_SUPABASE_* (dashboard .env)
@@ -37,8 +32,14 @@ def main():
         )
         return 1
 
+    # Imported here so missing-env errors above don't pay for loading the supabase client
+    from supabase import create_client
+
+    from odoo_client import connect
+    from sync_stock import fetch_stock_from_odoo
+
     cfg, uid, execute_kw = connect()
-    warehouses, stock_list = fetch_stock_from_odoo(execute_kw, None)
+    warehouses, stock_list, _ = fetch_stock_from_odoo(execute_kw, None)
 
     client = create_client(url, key)
 
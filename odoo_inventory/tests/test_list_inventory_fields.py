@@ -0,0 +1,190 @@
+"""
+Tests for list_inventory_fields.py schema snapshots and --diff, and for the
+snapshot-backed schema_cache.fields_get, against a fake execute_kw (no Odoo needed).
+Run: python -m pytest odoo_inventory/tests
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+import xmlrpc.client
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cli  # noqa: E402
+import list_inventory_fields  # noqa: E402
+import schema_cache  # noqa: E402
+from sync_stock import ODOO_FIELDS_USED  # noqa: E402
+
+
+def _schema():
+    """fields_get results per model: everything the sync reads plus a few extras."""
+    models = {m: {f: {"type": "char", "string": f} for f in fields} for m, fields in ODOO_FIELDS_USED.items()}
+    models["product.product"]["categ_id"] = {"type": "many2one", "string": "Category", "relation": "product.category"}
+    models["stock.quant"]["lot_id"] = {"type": "many2one", "string": "Lot", "relation": "stock.lot"}
+    models["stock.lot"] = {"name": {"type": "char", "string": "Lot"}}
+    return models
+
+
+class FakeOdoo:
+    def __init__(self):
+        self.schema = _schema()
+        self.modules = [{"name": "stock", "latest_version": "17.0.1.1"}]
+        self.calls = []
+
+    def execute_kw(self, model, method, args, kwargs=None):
+        self.calls.append((model, method))
+        if model == "ir.module.module":
+            return self.modules
+        if method == "fields_get":
+            if model not in self.schema:
+                raise Exception(f"Object {model} doesn't exist")
+            return self.schema[model]
+        raise AssertionError(f"unexpected call {model}.{method}")
+
+
+class FakeOdooTestCase(unittest.TestCase):
+    """Temp cache dir, fixed server version and a fresh FakeOdoo per test."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        env = {"ODOO_URL": "http://odoo.test", "ODOO_DB": "test", "ODOO_INVENTORY_CACHE_DIR": tmp.name}
+        for patcher in (
+            mock.patch.dict(os.environ, env),
+            mock.patch("odoo_client.server_version", return_value="17.0"),
+            mock.patch.dict(schema_cache._snapshots, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.odoo = FakeOdoo()
+
+    def _run(self, *argv):
+        ap = argparse.ArgumentParser()
+        list_inventory_fields.add_arguments(ap)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            code = list_inventory_fields.run(ap.parse_args(list(argv)), self.odoo.execute_kw)
+        return code, out.getvalue()
+
+    def _key(self):
+        return schema_cache.current_snapshot(self.odoo.execute_kw)["key"]
+
+
+class ListInventoryFieldsDiffTest(FakeOdooTestCase):
+    def test_unchanged_schema_sync_fields_diff_exits_0(self):
+        self.assertEqual(self._run()[0], 0)  # default models only; no product.category
+        code, out = self._run("--diff", self._key(), "--sync-fields")
+        result = json.loads(out)
+        self.assertEqual(code, 0, out)
+        self.assertEqual(result["missing_in_new"], [])
+        self.assertEqual(result["unknown_in_old"], [])
+        self.assertEqual(result["models"], {})
+
+    def test_model_not_in_old_snapshot_is_unknown_not_a_difference(self):
+        self._run()
+        old_key = self._key()
+        self.odoo.modules = [{"name": "stock", "latest_version": "17.0.1.2"}]  # upgrade: new key
+        code, out = self._run("--diff", old_key, "--sync-fields")
+        result = json.loads(out)
+        self.assertEqual(code, 0, out)
+        self.assertEqual(result["unknown_in_old"], ["product.category"])
+        self.assertNotEqual(result["old"]["key"], result["new"]["key"])
+
+    def test_removed_sync_field_after_upgrade_exits_1(self):
+        self._run("--depth", "1")
+        old_key = self._key()
+        self.odoo.modules = [{"name": "stock", "latest_version": "17.0.2.0"}]
+        del self.odoo.schema["stock.quant"]["reserved_quantity"]
+        code, out = self._run("--diff", old_key, "--sync-fields")
+        result = json.loads(out)
+        self.assertEqual(code, 1)
+        self.assertEqual(result["missing_in_new"], ["stock.quant.reserved_quantity"])
+        self.assertEqual(result["models"]["stock.quant"]["removed"], ["reserved_quantity"])
+
+    def test_cached_snapshot_skips_fields_get(self):
+        self._run()
+        self.odoo.calls.clear()
+        self._run()
+        self.assertNotIn("fields_get", [method for _, method in self.odoo.calls])
+
+    def test_cache_only_modes_do_not_connect(self):
+        self._run()
+        key = self._key()
+        unreachable = mock.patch("odoo_client.connect", side_effect=OSError("Connection refused"))
+        for argv in (["--list-cache"], ["--diff", key, "--against", key]):
+            for entry in (list_inventory_fields.main, lambda a: cli._run_local("fields", a)):
+                with self.subTest(argv=argv), unreachable, contextlib.redirect_stdout(io.StringIO()) as out:
+                    self.assertEqual(entry(argv), 0)
+                self.assertIn(key, out.getvalue())
+
+        with unreachable, self.assertRaises(OSError):
+            list_inventory_fields.main(["--diff", key])
+
+
+class SchemaCacheFieldsGetTest(FakeOdooTestCase):
+    """schema_cache.fields_get (used by list_product_by_id.py) shares the snapshots."""
+
+    def _fields_get_calls(self):
+        return [model for model, method in self.odoo.calls if method == "fields_get"]
+
+    def test_fields_get_reuses_list_inventory_fields_snapshot(self):
+        self._run()
+        self.odoo.calls.clear()
+        self.assertIn("default_code", schema_cache.fields_get(self.odoo.execute_kw, "product.product"))
+        self.assertEqual(self._fields_get_calls(), [])
+
+    def test_upgrade_invalidates_fields_get(self):
+        self.odoo.schema["product.product"]["image_1920"] = {"type": "binary", "string": "Image"}
+        self.assertIn("image_1920", schema_cache.fields_get(self.odoo.execute_kw, "product.product"))
+        self.assertNotIn("image_1920", schema_cache.non_binary_fields(self.odoo.execute_kw, "product.product"))
+
+        # New process after an upgrade: new snapshot key, so the model is fetched again
+        schema_cache._snapshots.clear()
+        self.odoo.modules = [{"name": "stock", "latest_version": "17.0.2.0"}]
+        self.odoo.schema["product.product"]["use_time"] = {"type": "integer", "string": "Use Time"}
+        self.odoo.calls.clear()
+        self.assertIn("use_time", schema_cache.fields_get(self.odoo.execute_kw, "product.product"))
+        self.assertEqual(self._fields_get_calls(), ["product.product"])
+
+    def test_snapshot_writes_use_unique_temp_files(self):
+        path = os.path.join(schema_cache._snapshot_dir(), "k.json")
+        real_replace, temps = os.replace, []
+
+        def replace(src, dst):
+            temps.append(src)
+            real_replace(src, dst)
+
+        with mock.patch("os.replace", replace):
+            schema_cache._write_json(path, {"key": "k", "n": 1})
+            schema_cache._write_json(path, {"key": "k", "n": 2})
+        self.assertEqual(len(set(temps)), 2)
+        self.assertNotIn(path + ".tmp", temps)
+
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            schema_cache._write_json(path, {"key": "k", "n": 3})
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["k.json"])
+        self.assertEqual(schema_cache.load_snapshot(path)["n"], 2)
+
+    def test_module_access_denied_keys_by_server_version_only(self):
+        denied = xmlrpc.client.Fault(4, "You are not allowed to access 'Module' (ir.module.module) records.")
+
+        def execute_kw(model, method, args, kwargs=None):
+            if model == "ir.module.module":
+                raise denied
+            return self.odoo.execute_kw(model, method, args, kwargs)
+
+        self.assertEqual(schema_cache.schema_identity(execute_kw), ("17.0", None))
+
+    def test_network_error_reading_modules_propagates(self):
+        with mock.patch.object(self.odoo, "execute_kw", side_effect=ConnectionResetError(104, "reset")):
+            with self.assertRaises(ConnectionResetError):
+                schema_cache.schema_identity(self.odoo.execute_kw)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for list_product_by_id.py (ID/code parsing, chunked reads, field projection,
+missing-record reporting) and its local fallback through cli.py, against a fake
+execute_kw (no Odoo needed).
+Run: python -m pytest odoo_inventory/tests
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cli  # noqa: E402
+import list_product_by_id  # noqa: E402
+from test_list_inventory_fields import FakeOdoo, FakeOdooTestCase  # noqa: E402
+
+PRODUCTS = [
+    {"id": 1, "default_code": "C001", "name": "Wheat Seed", "active": True, "image_1920": b"\x89PNG"},
+    {"id": 2, "default_code": "C002", "name": "Rice Seed", "active": True, "image_1920": b"\x89PNG"},
+    {"id": 3, "default_code": "C003", "name": "Urea", "active": True, "image_1920": False},
+    {"id": 4, "default_code": "OLD1", "name": "Discontinued", "active": False, "image_1920": False},
+]
+
+
+class FakeProductOdoo(FakeOdoo):
+    """FakeOdoo that also serves product.product read/search_read like Odoo does."""
+
+    def __init__(self):
+        super().__init__()
+        self.schema["product.product"]["image_1920"] = {"type": "binary", "string": "Image"}
+        self.products = {p["id"]: p for p in PRODUCTS}
+        self.product_calls = []
+
+    def execute_kw(self, model, method, args, kwargs=None):
+        if model != "product.product" or method not in ("read", "search_read"):
+            return super().execute_kw(model, method, args, kwargs)
+        kwargs = kwargs or {}
+        self.calls.append((model, method))
+        self.product_calls.append((method, args, kwargs))
+        if method == "read":
+            # read() ignores active: archived records are returned by ID
+            rows = [self.products[i] for i in args[0] if i in self.products]
+        else:
+            (field, op, codes), = args[0]
+            assert (field, op) == ("default_code", "in"), args
+            active_test = kwargs.get("context", {}).get("active_test", True)
+            rows = [
+                p for p in self.products.values()
+                if p["default_code"] in codes and (p["active"] or not active_test)
+            ]
+        fields = kwargs.get("fields")
+        return [{k: v for k, v in p.items() if not fields or k == "id" or k in fields} for p in rows]
+
+
+class ProductTestCase(FakeOdooTestCase):
+    def setUp(self):
+        super().setUp()
+        self.odoo = FakeProductOdoo()
+
+    def _run(self, *argv):
+        ap = argparse.ArgumentParser()
+        list_product_by_id.add_arguments(ap)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            code = list_product_by_id.run(ap.parse_args(list(argv)), self.odoo.execute_kw)
+        return code, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class ParseTest(unittest.TestCase):
+    def test_parse_ids_expands_ranges_and_lists_in_order(self):
+        self.assertEqual(list_product_by_id.parse_ids(["5", "1-3", "2,7", "3"]), [5, 1, 2, 3, 7])
+
+    def test_bad_id_token_is_a_usage_error(self):
+        ap = argparse.ArgumentParser()
+        list_product_by_id.add_arguments(ap)
+        for token in ("abc", "5-", "-3", "9-2", ","):
+            with self.subTest(token=token), contextlib.redirect_stderr(io.StringIO()) as err:
+                with self.assertRaises(SystemExit) as cm:
+                    ap.parse_args([token])
+                self.assertEqual(cm.exception.code, 2)
+                self.assertIn("argument ids", err.getvalue())
+
+    def test_parse_codes_from_options_and_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("C002\n\n  C003 \nC001\n")
+        self.addCleanup(os.unlink, f.name)
+        codes = list_product_by_id._parse_codes(["C001,C002", " C004"], f.name)
+        self.assertEqual(codes, ["C001", "C002", "C004", "C003"])
+
+    def test_parse_codes_from_stdin(self):
+        with mock.patch("sys.stdin", io.StringIO("C001\nC002\n")):
+            self.assertEqual(list_product_by_id._parse_codes(None, "-"), ["C001", "C002"])
+
+
+class RunTest(ProductTestCase):
+    def test_ids_are_read_in_chunks(self):
+        code, rows = self._run("1-3", "--chunk-size", "2", "--fields", "name")
+        self.assertEqual(code, 0)
+        self.assertEqual([r["id"] for r in rows], [1, 2, 3])
+        self.assertEqual([args[0] for _, args, _ in self.odoo.product_calls], [[1, 2], [3]])
+
+    def test_missing_ids_and_codes_are_reported_with_exit_1(self):
+        code, rows = self._run("1", "99", "--code", "C002,NOPE", "--fields", "name")
+        self.assertEqual(code, 1)
+        self.assertIn({"error": "Product not found", "id": 99}, rows)
+        self.assertIn({"error": "Product not found", "default_code": "NOPE"}, rows)
+        self.assertEqual(len(rows), 4)
+
+    def test_default_projection_skips_binary_fields(self):
+        code, rows = self._run("1", "--code", "C002")
+        self.assertEqual(code, 0)
+        for method, _, kwargs in self.odoo.product_calls:
+            self.assertNotIn("image_1920", kwargs["fields"], method)
+            self.assertIn("name", kwargs["fields"], method)
+        self.assertTrue(all("image_1920" not in r for r in rows))
+
+    def test_all_fields_shows_binary_as_placeholder(self):
+        _, rows = self._run("1", "--all-fields")
+        self.assertEqual(rows[0]["image_1920"], "<binary 4 bytes>")
+
+    def test_code_lookup_with_fields_matches_read_by_id_shape(self):
+        code, rows = self._run("1", "--code", "C002", "--fields", "name")
+        self.assertEqual(code, 0)
+        self.assertEqual(rows, [{"id": 1, "name": "Wheat Seed"}, {"id": 2, "name": "Rice Seed"}])
+
+    def test_code_lookup_keeps_default_code_when_requested(self):
+        _, rows = self._run("--code", "C003", "--fields", "name,default_code")
+        self.assertEqual(rows, [{"id": 3, "name": "Urea", "default_code": "C003"}])
+
+    def test_archived_product_is_found_by_code(self):
+        code, rows = self._run("4", "--code", "OLD1", "--fields", "name")
+        self.assertEqual(code, 0)
+        self.assertEqual(rows, [{"id": 4, "name": "Discontinued"}] * 2)
+
+
+class CliFallbackTest(ProductTestCase):
+    def test_codes_from_stdin_survive_fallback_from_unreachable_daemon(self):
+        sock_path = os.path.join(os.environ["ODOO_INVENTORY_CACHE_DIR"], "stale.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(sock_path)  # socket file left behind by a daemon that is gone
+        stale.close()
+
+        env = {"ODOO_USERNAME": "bot", "ODOO_PASSWORD": "secret"}
+        cfg = {"url": "http://odoo.test", "db": "test", "username": "bot", "password": "secret"}
+        out = io.StringIO()
+        with mock.patch.dict(os.environ, env), \
+                mock.patch("odoo_client.connect", return_value=(cfg, 2, self.odoo.execute_kw)), \
+                mock.patch("sys.stdin", io.StringIO("C001\nC003\n")), \
+                contextlib.redirect_stdout(out):
+            code = cli.main(["--socket", sock_path, "product", "--codes-file", "-", "--fields", "name"])
+
+        self.assertEqual(code, 0)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(rows, [{"id": 1, "name": "Wheat Seed"}, {"id": 3, "name": "Urea"}])
+
+
+if __name__ == "__main__":
+    unittest.main()